@@ -3,10 +3,19 @@ Forms for the analyzer app.
 Handles CSV file upload with validation.
 """
 from django import forms
+from django.conf import settings
+from django.template.defaultfilters import filesizeformat
 from .models import UploadedFile
 import os
 
 
+def size_limit_message():
+    """
+    Error message for uploads larger than MAX_UPLOAD_SIZE.
+    """
+    return f"File size must not exceed {filesizeformat(settings.MAX_UPLOAD_SIZE)}."
+
+
 class CSVUploadForm(forms.ModelForm):
     """
     Form for uploading CSV files with validation.
@@ -38,8 +47,8 @@ class CSVUploadForm(forms.ModelForm):
         if ext != '.csv':
             raise forms.ValidationError("Only CSV files are allowed.")
         
-        # Check file size (10MB limit)
-        if file.size > 10 * 1024 * 1024:
-            raise forms.ValidationError("File size must not exceed 10MB.")
+        # Check file size
+        if file.size > settings.MAX_UPLOAD_SIZE:
+            raise forms.ValidationError(size_limit_message())
         
         return file
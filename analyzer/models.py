@@ -2,8 +2,11 @@
 Models for the analyzer app.
 Handles uploaded CSV files and their metadata.
 """
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
+from .paths import feather_path
+import glob
 import os
 
 
@@ -30,4 +33,12 @@ class UploadedFile(models.Model):
         """
         if self.file and os.path.isfile(self.file.path):
             os.remove(self.file.path)
+        
+        # Remove the columnar copy written by analyzer.utils
+        if self.file and os.path.isfile(feather_path(self.file.path)):
+            os.remove(feather_path(self.file.path))
+        
+        # Remove visualizations rendered for this file
+        for path in glob.glob(os.path.join(settings.VISUALIZATION_ROOT, f'{self.id}_*.png')):
+            os.remove(path)
         super().delete(*args, **kwargs)
@@ -0,0 +1,14 @@
+"""
+File paths shared by the analyzer models and utilities.
+Kept free of heavy imports so models.py can use it.
+"""
+
+# Columnar copy written next to each CSV after its first full parse
+FEATHER_SUFFIX = '.feather'
+
+
+def feather_path(file_path):
+    """
+    Path of the Feather copy kept alongside a CSV file.
+    """
+    return file_path + FEATHER_SUFFIX
@@ -1,7 +1,15 @@
 # Test models
-from django.test import TestCase
+from django.test import RequestFactory, TestCase, override_settings
+from unittest import mock, skipIf
 from .models import UploadedFile
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import StopUpload
+from . import utils, views
+from .upload_handlers import SizeLimitUploadHandler
+import os
+import tempfile
+import numpy as np
+import pandas as pd
 
 
 class UploadedFileModelTest(TestCase):
@@ -21,3 +29,270 @@ class UploadedFileModelTest(TestCase):
         self.assertEqual(file_obj.original_filename, "test.csv")
         self.assertEqual(file_obj.row_count, 2)
         self.assertEqual(file_obj.column_count, 2)
+
+
+class GetDfCacheTest(TestCase):
+    def test_get_df_reuses_parsed_frame(self):
+        """Test that repeated loads of an unchanged file hit the cache"""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write("col1,col2\n1,2\n3,4\n")
+        try:
+            first = utils.get_df(1, f.name)
+            second = utils.get_df(1, f.name)
+            self.assertIs(first, second)
+            self.assertEqual(len(first), 2)
+        finally:
+            os.remove(f.name)
+
+
+class DuplicateHeaderTest(TestCase):
+    def test_duplicate_headers_are_renamed(self):
+        """Test that repeated column names are read as v, v.1 on every path"""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write("v,w,v\n1,2,3\n4,5,7\n6,8,9\n")
+        feather = utils.feather_path(f.name)
+        try:
+            df = utils.load_csv(f.name)
+            self.assertEqual(df.columns.tolist(), ['v', 'w', 'v.1'])
+            sample = utils._read_csv(f.name, nrows=2)
+            self.assertEqual(sample.columns.tolist(), df.columns.tolist())
+            subset = utils._read_csv(f.name, usecols=['w', 'v.1'])
+            self.assertEqual(subset.columns.tolist(), ['w', 'v.1'])
+            
+            html, stats = utils.generate_statistical_summary(df)
+            self.assertIn('v.1', html)
+            img, stats = utils.generate_eda_report(df)
+            self.assertEqual(stats['n_numeric'], 3)
+            img, stats = utils.perform_linear_regression(df)
+            self.assertNotIn('error', stats)
+        finally:
+            for path in (f.name, feather):
+                if os.path.exists(path):
+                    os.remove(path)
+    
+    def test_blank_headers_are_renamed(self):
+        """Test that a to_csv() index column is read as Unnamed: 0 on every path"""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write(",a,b\n0,1,2\n1,3,4\n")
+        feather = utils.feather_path(f.name)
+        try:
+            df = utils.load_csv(f.name)
+            self.assertEqual(df.columns.tolist(), ['Unnamed: 0', 'a', 'b'])
+            sample = utils._read_csv(f.name, nrows=1)
+            self.assertEqual(sample.columns.tolist(), df.columns.tolist())
+        finally:
+            for path in (f.name, feather):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+class LinearRegressionTest(TestCase):
+    def test_regression_recovers_exact_line(self):
+        """Test the closed-form fit on perfectly linear data"""
+        df = pd.DataFrame({"x": [1.0, 2.0, 3.0, 4.0], "y": [3.0, 5.0, 7.0, 9.0]})
+        img, stats = utils.perform_linear_regression(df)
+        
+        self.assertIsNotNone(img)
+        self.assertAlmostEqual(stats["slope"], 2.0)
+        self.assertAlmostEqual(stats["intercept"], 1.0)
+        self.assertAlmostEqual(stats["r_squared"], 1.0)
+    
+    @skipIf(utils.numba is None, "numba is not installed")
+    def test_numba_kernel_matches_numpy(self):
+        """Test the numba kernel against the numpy implementation"""
+        rng = np.random.default_rng(0)
+        x = rng.normal(size=1000)
+        y = 3 * x + 1 + rng.normal(size=1000)
+        
+        expected = utils._linreg_stats(x, y)
+        actual = utils._linreg_stats_jit(x, y)
+        
+        for a, b in zip(actual[:3], expected[:3]):
+            self.assertAlmostEqual(a, b)
+
+
+class UploadSizeLimitTest(TestCase):
+    @override_settings(MAX_UPLOAD_SIZE=100)
+    def test_oversized_upload_is_rejected(self):
+        """Test that uploads above MAX_UPLOAD_SIZE are not stored"""
+        csv_content = b"col1,col2\n" + b"1,2\n" * 100
+        upload = SimpleUploadedFile("big.csv", csv_content, content_type="text/csv")
+        
+        response = self.client.post('/upload/', {'file': upload}, follow=True)
+        
+        self.assertRedirects(response, '/')
+        self.assertContains(response, "File size must not exceed 100\xa0bytes.")
+        self.assertEqual(UploadedFile.objects.count(), 0)
+    
+    @override_settings(MAX_UPLOAD_SIZE=1000)
+    def test_upload_at_size_limit_is_accepted(self):
+        """Test that multipart overhead does not count against the limit"""
+        csv_content = b"col1,col2\n" + b"1,2\n" * 246 + b"10,20\n"
+        self.assertEqual(len(csv_content), 1000)
+        upload = SimpleUploadedFile("edge.csv", csv_content, content_type="text/csv")
+        
+        # Stub the background parse so it cannot race the delete below
+        with tempfile.TemporaryDirectory() as media_root:
+            with override_settings(MEDIA_ROOT=media_root), \
+                    mock.patch.object(views.OPERATION_EXECUTOR, 'submit') as submit:
+                self.client.post('/upload/', {'file': upload})
+                
+                uploaded = UploadedFile.objects.get()
+                self.assertEqual(uploaded.file_size, 1000)
+                submit.assert_called_once_with(utils.get_df, uploaded.id, uploaded.file.path)
+                uploaded.delete()
+    
+    @override_settings(MAX_UPLOAD_SIZE=100)
+    def test_upload_handler_stops_oversized_file(self):
+        """Test that the handler aborts once the running size passes the limit"""
+        request = RequestFactory().post('/upload/')
+        handler = SizeLimitUploadHandler(request)
+        handler.new_file('file', 'big.csv', 'text/csv', None)
+        handler.receive_data_chunk(b"x" * 60, 0)
+        with self.assertRaises(StopUpload):
+            handler.receive_data_chunk(b"x" * 60, 60)
+        self.assertTrue(request.upload_too_large)
+
+
+class UploadParseTest(TestCase):
+    def test_malformed_csv_is_rejected(self):
+        """Test that a CSV the parser rejects is reported and not stored"""
+        upload = SimpleUploadedFile("bad.csv", b"a,b\n1,2\n3,4,5\n", content_type="text/csv")
+        
+        with tempfile.TemporaryDirectory() as media_root:
+            with override_settings(MEDIA_ROOT=media_root):
+                response = self.client.post('/upload/', {'file': upload}, follow=True)
+            self.assertEqual(os.listdir(os.path.join(media_root, 'uploads')), [])
+        
+        self.assertRedirects(response, '/')
+        self.assertContains(response, "Error reading CSV file: Error tokenizing data")
+        self.assertEqual(UploadedFile.objects.count(), 0)
+
+
+class QuickCsvShapeTest(TestCase):
+    def _shape(self, content):
+        with tempfile.NamedTemporaryFile('wb', suffix='.csv', delete=False) as f:
+            f.write(content)
+        try:
+            return utils.quick_csv_shape(f.name)
+        finally:
+            os.remove(f.name)
+    
+    def test_shape_matches_pandas(self):
+        """Test row/column counts with and without a trailing newline"""
+        self.assertEqual(self._shape(b'a,"b,c",d\n1,2,3\n4,5,6\n'), (2, 3))
+        self.assertEqual(self._shape(b'a,b\r\n1,2\r\n3,4'), (2, 2))
+        self.assertEqual(self._shape(b'a,b\n'), (0, 2))
+    
+    def test_empty_file(self):
+        """Test that an empty file is reported as unreadable"""
+        self.assertIsNone(self._shape(b''))
+
+
+class DownloadCsvTest(TestCase):
+    @override_settings(USE_X_ACCEL_REDIRECT=True)
+    def test_download_is_offloaded_to_web_server(self):
+        """Test that X-Accel-Redirect points at the stored upload"""
+        upload = SimpleUploadedFile("data.csv", b"a,b\n1,2\n", content_type="text/csv")
+        file_obj = UploadedFile.objects.create(file=upload, original_filename="data.csv")
+        
+        response = self.client.get(f'/download-csv/{file_obj.id}/')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected/{file_obj.file.name}')
+        self.assertEqual(response.content, b'')
+        file_obj.delete()
+
+
+class TablePreviewTest(TestCase):
+    def test_preview_escapes_and_limits_rows(self):
+        """Test the hand-built preview table"""
+        df = pd.DataFrame({"name": ["<b>", "x", "y"], "value": [1.5, np.nan, 3.0]})
+        html = utils.generate_table_preview(df, max_rows=2)
+        
+        self.assertIn('class="dataframe data-table"', html)
+        self.assertIn('<td>&lt;b&gt;</td>', html)
+        self.assertIn('<td>NaN</td>', html)
+        self.assertEqual(html.count('<tr>'), 2)
+    
+    def test_preview_formats_floats_and_dates(self):
+        """Test that floats use the display precision and midnight dates drop the time"""
+        df = pd.DataFrame({
+            "value": [0.1 + 0.2, 1 / 3, 3.0],
+            "when": pd.to_datetime(["2020-01-01 00:00", "2020-01-02 10:30", "2020-01-03 00:00"]),
+        })
+        html = utils.generate_table_preview(df)
+        
+        for text in ('0.3', '0.333333', '3.0', '2020-01-01', '2020-01-02 10:30:00'):
+            self.assertIn(f'<td>{text}</td>', html)
+
+
+class StatisticalSummaryTest(TestCase):
+    def test_summary_matches_describe_all(self):
+        """Test the split summary against describe(include='all') on mixed dtypes"""
+        df = pd.DataFrame({
+            "name": ["a", "b", "a", None],
+            "count": [1, 2, 3, 4],
+            "when": pd.to_datetime(["2020-01-01", "2020-01-02", None, "2020-01-02"]),
+            "score": [1.5, np.nan, 2.0, 3.0],
+            "flag": [True, False, True, True],
+        })
+        expected = df.describe(include='all').transpose().to_html(classes='stats-table', border=0)
+        
+        html, stats = utils.generate_statistical_summary(df)
+        
+        self.assertEqual(html, expected)
+        self.assertEqual(stats["n_numeric"], 2)
+
+
+class FeatherCopyTest(TestCase):
+    def test_full_read_writes_and_reuses_feather_copy(self):
+        """Test that a full parse leaves a Feather copy used for column reads"""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write("a,b,c\n1,2,x\n3,4,y\n")
+        feather = utils.feather_path(f.name)
+        try:
+            df = utils.load_csv(f.name)
+            self.assertTrue(os.path.exists(feather))
+            
+            subset = utils._read_csv(f.name, usecols=['a', 'b'])
+            self.assertEqual(subset.columns.tolist(), ['a', 'b'])
+            self.assertTrue(subset.equals(df[['a', 'b']]))
+        finally:
+            for path in (f.name, feather):
+                if os.path.exists(path):
+                    os.remove(path)
+    
+    def test_column_read_with_blank_header_and_feather_copy(self):
+        """Test that sample column names still resolve once the Feather copy exists"""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write(",a,b\n0,1,2\n1,3,4\n")
+        feather = utils.feather_path(f.name)
+        try:
+            utils.load_csv(f.name)
+            self.assertTrue(os.path.exists(feather))
+            usecols = utils._read_csv(f.name, nrows=1).columns[:2].tolist()
+            
+            subset = utils._read_csv(f.name, usecols=usecols)
+            self.assertEqual(subset.columns.tolist(), ['Unnamed: 0', 'a'])
+            
+            # A copy that names the blank header '' is read around, not trusted
+            pd.DataFrame({'': [0, 1], 'a': [1, 3], 'b': [2, 4]}).to_feather(feather)
+            subset = utils._read_csv(f.name, usecols=usecols)
+            self.assertEqual(subset.columns.tolist(), ['Unnamed: 0', 'a'])
+        finally:
+            for path in (f.name, feather):
+                if os.path.exists(path):
+                    os.remove(path)
+    
+    def test_no_feather_copy_for_deleted_csv(self):
+        """Test that a parse finishing after the upload was deleted leaves no copy"""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write("a,b\n1,2\n")
+        df = utils.load_csv(f.name)
+        os.remove(f.name)
+        os.remove(utils.feather_path(f.name))
+        
+        utils._write_feather(df, f.name)
+        
+        self.assertFalse(os.path.exists(utils.feather_path(f.name)))
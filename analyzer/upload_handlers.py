@@ -0,0 +1,30 @@
+"""
+Upload handlers for the analyzer app.
+Rejects oversized CSV uploads while they are still streaming in.
+"""
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+
+
+class SizeLimitUploadHandler(FileUploadHandler):
+    """
+    Stop an upload as soon as a file grows past MAX_UPLOAD_SIZE.
+    
+    Must be listed first in FILE_UPLOAD_HANDLERS so the chunks are dropped
+    before the memory/temporary-file handlers buffer or write them.
+    """
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+    
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.MAX_UPLOAD_SIZE:
+            # Flag the request so the view can report the size instead of
+            # a missing file; the rest of the body is read and discarded
+            self.request.upload_too_large = True
+            raise StopUpload(connection_reset=False)
+        return raw_data
+    
+    def file_complete(self, file_size):
+        return None
@@ -6,20 +6,111 @@ import pandas as pd
 import numpy as np
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import seaborn as sns
-from sklearn.linear_model import LinearRegression
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from io import BytesIO
 import base64
+import csv
+import functools
 import os
+import queue
+import tempfile
+from html import escape
+from .paths import FEATHER_SUFFIX, feather_path  # noqa: F401
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Multi-threaded CSV parser when available
+CSV_ENGINE = 'pyarrow' if HAS_PYARROW else 'c'
+
+try:
+    import numba  # Optional: JIT kernel for large regressions
+except ImportError:
+    numba = None
 
 
 # Set style for all plots
 sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (10, 6)
-plt.rcParams['figure.dpi'] = 100
+matplotlib.rcParams['figure.figsize'] = (10, 6)
+matplotlib.rcParams['figure.dpi'] = 100
+
+# Idle figures kept for reuse; plotting bypasses pyplot and its global registry
+FIGURE_POOL_SIZE = 8
+_FIGURE_POOL = queue.LifoQueue(maxsize=FIGURE_POOL_SIZE)
+
+
+# Rows read for previews and for sniffing column dtypes without a full parse
+SAMPLE_ROWS = 1000
+
+
+def _write_feather(df, file_path):
+    """
+    Save a parsed CSV as Feather so later reads skip tokenizing.
+    Failures (e.g. column types Arrow cannot store) just leave no copy, and
+    no copy is kept if the CSV was removed meanwhile.
+    """
+    path = feather_path(file_path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+    try:
+        df.to_feather(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Error writing Feather copy: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    
+    # The upload may have been deleted while it was being parsed; don't
+    # leave a copy behind for a CSV that no longer exists
+    if not os.path.exists(file_path) and os.path.exists(path):
+        os.remove(path)
+
+
+def _read_csv(file_path, usecols=None, nrows=None):
+    """
+    Parse a CSV file with the fastest available pandas engine, falling back
+    to the C engine for files pyarrow rejects or reads differently.
+    Only the requested columns / leading rows are tokenized; full reads come
+    from the Feather copy when it is at least as new as the CSV.
+    """
+    if nrows is not None:
+        # The pyarrow engine does not support nrows
+        return pd.read_csv(file_path, usecols=usecols, nrows=nrows)
+    
+    if HAS_PYARROW:
+        path = feather_path(file_path)
+        if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(file_path):
+            try:
+                return pd.read_feather(path, columns=usecols)
+            except Exception as e:
+                # e.g. a copy whose column names differ from the C engine's;
+                # treat it as a miss and parse the CSV
+                print(f"Error reading Feather copy: {e}")
+    
+    df = None
+    if CSV_ENGINE == 'pyarrow':
+        try:
+            df = pd.read_csv(file_path, engine='pyarrow', usecols=usecols)
+        except Exception:
+            df = None
+        # pyarrow keeps duplicate and blank header names as-is; the C engine
+        # renames them (v, v.1, ..., Unnamed: N) the way the nrows reads and
+        # the rest of the app expect
+        if df is not None and (df.columns.has_duplicates or (df.columns == '').any()):
+            df = None
+    if df is None:
+        df = pd.read_csv(file_path, usecols=usecols)
+    
+    if HAS_PYARROW and usecols is None:
+        _write_feather(df, file_path)
+    return df
 
 
 def load_csv(file_path):
@@ -33,13 +124,99 @@ def load_csv(file_path):
         DataFrame or None if error
     """
     try:
-        df = pd.read_csv(file_path)
+        df = _read_csv(file_path)
         return df
     except Exception as e:
         print(f"Error loading CSV: {e}")
         return None
 
 
+@functools.lru_cache(maxsize=32)
+def _read_csv_cached(file_id, file_path, mtime, usecols, nrows):
+    """
+    Parse a CSV file once per (file_id, path, mtime, usecols, nrows) and keep
+    the result. The mtime is part of the key so a rewritten file is parsed again.
+    """
+    if usecols is not None:
+        usecols = list(usecols)
+    return _read_csv(file_path, usecols=usecols, nrows=nrows)
+
+
+def get_df(file_id, file_path, usecols=None, nrows=None):
+    """
+    Load an uploaded CSV file through the process-level DataFrame cache.
+    The returned DataFrame is shared between requests and must not be
+    modified in place.
+    
+    Args:
+        file_id: Primary key of the UploadedFile
+        file_path: Path to the CSV file
+        usecols: Optional list of columns to read
+        nrows: Optional number of leading rows to read
+    
+    Returns:
+        DataFrame or None if error
+    """
+    if usecols is not None:
+        usecols = tuple(usecols)
+    try:
+        mtime = os.path.getmtime(file_path)
+        return _read_csv_cached(file_id, file_path, mtime, usecols, nrows)
+    except Exception as e:
+        print(f"Error loading CSV: {e}")
+        return None
+
+
+def read_sample(file_id, file_path):
+    """
+    Parse the leading SAMPLE_ROWS rows of an uploaded CSV file through the
+    DataFrame cache. Unlike get_df, parse errors are raised to the caller.
+    
+    Args:
+        file_id: Primary key of the UploadedFile
+        file_path: Path to the CSV file
+    
+    Returns:
+        DataFrame
+    """
+    mtime = os.path.getmtime(file_path)
+    return _read_csv_cached(file_id, file_path, mtime, None, SAMPLE_ROWS)
+
+
+def quick_csv_shape(file_path, chunk_size=1024 * 1024):
+    """
+    Count the rows and columns of a CSV file without parsing it.
+    Columns come from the header line, rows from a newline count over the
+    raw bytes (quoted values spanning several lines are counted per line).
+    
+    Args:
+        file_path: Path to the CSV file
+        chunk_size: Bytes read per chunk while counting newlines
+    
+    Returns:
+        Tuple of (row_count, column_count) or None if empty or unreadable
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            header = f.readline()
+            if not header.strip():
+                return None
+            column_count = len(next(csv.reader([header.decode('utf-8', errors='replace')])))
+            
+            newlines = header.count(b'\n')
+            last = header[-1:]
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                newlines += chunk.count(b'\n')
+                last = chunk[-1:]
+        
+        # The header line is not a data row; count a final unterminated line
+        row_count = newlines - 1 + (0 if last == b'\n' else 1)
+        return row_count, column_count
+    except Exception as e:
+        print(f"Error reading CSV shape: {e}")
+        return None
+
+
 def get_numeric_columns(df):
     """
     Get list of numeric columns from DataFrame.
@@ -53,25 +230,121 @@ def get_numeric_columns(df):
     return df.select_dtypes(include=[np.number]).columns.tolist()
 
 
-def plot_to_base64(fig):
+def _numeric_matrix(df, numeric_cols):
+    """
+    Materialize the numeric columns as a single float64 array (NaN for missing).
+    
+    Args:
+        df: pandas DataFrame
+        numeric_cols: List of numeric column names
+    
+    Returns:
+        2-D numpy array with one column per entry in numeric_cols
+    """
+    return df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _plot_histogram(ax, values, bins=30, **kwargs):
+    """
+    Draw a histogram from precomputed np.histogram counts.
+    
+    Args:
+        ax: matplotlib axes to draw on
+        values: 1-D numpy array without NaN
+        bins: Number of bins
+        **kwargs: Passed through to ax.bar (color, alpha, edgecolor, ...)
+    """
+    counts, edges = np.histogram(values, bins=bins)
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', **kwargs)
+
+
+def get_figure(figsize):
+    """
+    Take a blank Agg figure from the pool, or create one if the pool is empty.
+    
+    Args:
+        figsize: (width, height) in inches
+    
+    Returns:
+        matplotlib Figure attached to an Agg canvas
+    """
+    try:
+        fig = _FIGURE_POOL.get_nowait()
+        fig.set_size_inches(figsize)
+    except queue.Empty:
+        # Constrained layout keeps tick labels, titles and colorbars inside
+        # the fixed figure size without a bbox_inches='tight' second draw
+        fig = Figure(figsize=figsize, layout='constrained')
+        FigureCanvasAgg(fig)
+    return fig
+
+
+def release_figure(fig):
+    """
+    Clear a figure and return it to the pool (dropped if the pool is full).
+    
+    Args:
+        fig: Figure obtained from get_figure
+    """
+    # The layout engine is kept, so the next plot is laid out the same way
+    fig.clear()
+    try:
+        _FIGURE_POOL.put_nowait(fig)
+    except queue.Full:
+        pass
+
+
+def plot_to_png(fig):
     """
-    Convert matplotlib figure to base64 encoded string.
+    Render matplotlib figure to PNG bytes.
     
     Args:
         fig: matplotlib figure object
     
     Returns:
-        Base64 encoded string of the image
+        PNG image as bytes
     """
     buffer = BytesIO()
-    fig.savefig(buffer, format='png', bbox_inches='tight', facecolor='white')
-    buffer.seek(0)
+    # Pooled figures use constrained layout, so no bbox_inches='tight'; PNG
+    # encoding favours speed over file size
+    fig.savefig(buffer, format='png', facecolor='white',
+                pil_kwargs={'compress_level': 1})
+    release_figure(fig)
+    
     image_png = buffer.getvalue()
     buffer.close()
-    plt.close(fig)
+    return image_png
+
+
+def png_to_base64(image_png):
+    """
+    Encode PNG bytes as a base64 string for embedding in JSON/HTML.
     
-    graphic = base64.b64encode(image_png)
-    return graphic.decode('utf-8')
+    Args:
+        image_png: PNG image as bytes
+    
+    Returns:
+        Base64 encoded string of the image
+    """
+    # base64 output is pure ASCII
+    return base64.b64encode(image_png).decode('ascii')
+
+
+def _format_cell(value, precision):
+    """
+    Format one DataFrame value as escaped HTML text, close to to_html's
+    output: missing values as NaN, floats to the display precision and
+    midnight timestamps as plain dates.
+    """
+    if value is None or value is pd.NA or (isinstance(value, float) and np.isnan(value)):
+        return 'NaN'
+    if isinstance(value, float):
+        text = f'{value:.{precision}g}'
+        # Keep whole floats recognisable as floats (3.0, not 3)
+        return text + '.0' if text.lstrip('-').isdigit() else text
+    if isinstance(value, pd.Timestamp) and value.tz is None and value == value.normalize():
+        return value.date().isoformat()
+    return escape(str(value))
 
 
 def generate_table_preview(df, max_rows=10):
@@ -86,8 +359,108 @@ def generate_table_preview(df, max_rows=10):
         HTML string of the table
     """
     preview_df = df.head(max_rows)
-    html = preview_df.to_html(classes='data-table', index=False, border=0)
-    return html
+    
+    # Build the markup directly; to_html's formatter is far heavier than
+    # needed for a handful of rows
+    precision = pd.get_option('display.precision')
+    header = ''.join(f'<th>{escape(str(col))}</th>' for col in preview_df.columns)
+    rows = ''.join(
+        '<tr>' + ''.join(f'<td>{_format_cell(value, precision)}</td>' for value in row) + '</tr>'
+        for row in preview_df.itertuples(index=False, name=None)
+    )
+    return (
+        '<table border="0" class="dataframe data-table">'
+        f'<thead><tr style="text-align: right;">{header}</tr></thead>'
+        f'<tbody>{rows}</tbody>'
+        '</table>'
+    )
+
+
+# Below this many points the numpy path is faster than dispatching to numba
+NUMBA_MIN_ROWS = 100_000
+
+
+if numba is not None:
+    # Serial on purpose: parallel=True kernels are not safe to call from the
+    # operation thread pool under numba's default workqueue threading layer
+    @numba.njit(cache=True, fastmath=True)
+    def _linreg_stats_jit(x, y):
+        """
+        Fused numba version of _linreg_stats for large inputs.
+        """
+        n = x.shape[0]
+        sx = 0.0
+        sy = 0.0
+        for i in range(n):
+            sx += x[i]
+            sy += y[i]
+        x_mean = sx / n
+        y_mean = sy / n
+        
+        sxx = 0.0
+        sxy = 0.0
+        syy = 0.0
+        for i in range(n):
+            dx = x[i] - x_mean
+            dy = y[i] - y_mean
+            sxx += dx * dx
+            sxy += dx * dy
+            syy += dy * dy
+        slope = sxy / sxx if sxx != 0.0 else 0.0
+        intercept = y_mean - slope * x_mean
+        
+        y_pred = np.empty(n)
+        ss_res = 0.0
+        for i in range(n):
+            y_pred[i] = slope * x[i] + intercept
+            r = y[i] - y_pred[i]
+            ss_res += r * r
+        
+        if syy != 0.0:
+            r2 = 1.0 - ss_res / syy
+        else:
+            r2 = 1.0 if ss_res == 0.0 else 0.0
+        
+        return slope, intercept, r2, y_pred
+else:
+    _linreg_stats_jit = None
+
+
+def _linreg_stats(x, y):
+    """
+    Closed-form simple linear regression of y on x.
+    Uses the numba kernel for large inputs when numba is installed.
+    
+    Args:
+        x: 1-D float array of the independent variable
+        y: 1-D float array of the dependent variable
+    
+    Returns:
+        Tuple of (slope, intercept, r_squared, y_pred)
+    """
+    if _linreg_stats_jit is not None and len(x) >= NUMBA_MIN_ROWS:
+        return _linreg_stats_jit(x, y)
+    
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    dy = y - y_mean
+    
+    sxx = np.dot(dx, dx)
+    slope = np.dot(dx, dy) / sxx if sxx else 0.0
+    intercept = y_mean - slope * x_mean
+    y_pred = slope * x + intercept
+    
+    # Same conventions as sklearn's r2_score for constant y
+    residuals = y - y_pred
+    ss_res = np.dot(residuals, residuals)
+    ss_tot = np.dot(dy, dy)
+    if ss_tot:
+        r2 = 1.0 - ss_res / ss_tot
+    else:
+        r2 = 1.0 if ss_res == 0 else 0.0
+    
+    return slope, intercept, r2, y_pred
 
 
 def perform_linear_regression(df):
@@ -99,7 +472,7 @@ def perform_linear_regression(df):
         df: pandas DataFrame
     
     Returns:
-        Tuple of (base64 image, statistics dict)
+        Tuple of (PNG image bytes, statistics dict)
     """
     numeric_cols = get_numeric_columns(df)
     
@@ -110,28 +483,25 @@ def perform_linear_regression(df):
     x_col = numeric_cols[0]
     y_col = numeric_cols[1]
     
-    # Remove NaN values
-    clean_df = df[[x_col, y_col]].dropna()
-    
-    if len(clean_df) < 2:
-        return None, {"error": "Not enough valid data points"}
+    # 1-D float views of the columns (no copy for float64 data)
+    X = df[x_col].to_numpy(dtype=np.float64, copy=False)
+    y = df[y_col].to_numpy(dtype=np.float64, copy=False)
     
-    X = clean_df[x_col].values.reshape(-1, 1)
-    y = clean_df[y_col].values
+    # Remove NaN values (only copies when there is something to drop)
+    valid = ~(np.isnan(X) | np.isnan(y))
+    if not valid.all():
+        X = X[valid]
+        y = y[valid]
     
-    # Fit linear regression
-    model = LinearRegression()
-    model.fit(X, y)
-    
-    # Make predictions
-    y_pred = model.predict(X)
+    if len(X) < 2:
+        return None, {"error": "Not enough valid data points"}
     
-    # Calculate R-squared
-    from sklearn.metrics import r2_score
-    r2 = r2_score(y, y_pred)
+    # Fit linear regression and calculate R-squared
+    slope, intercept, r2, y_pred = _linreg_stats(X, y)
     
     # Create plot
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = get_figure((10, 6))
+    ax = fig.subplots()
     ax.scatter(X, y, alpha=0.6, s=50, color='#2E7D32', label='Data points')
     ax.plot(X, y_pred, color='#1B5E20', linewidth=2, label=f'Regression line (R²={r2:.3f})')
     ax.set_xlabel(x_col, fontsize=12)
@@ -140,57 +510,70 @@ def perform_linear_regression(df):
     ax.legend()
     ax.grid(True, alpha=0.3)
     
-    # Convert to base64
-    img = plot_to_base64(fig)
+    # Render to PNG
+    img = plot_to_png(fig)
     
     stats = {
         "x_variable": x_col,
         "y_variable": y_col,
-        "slope": float(model.coef_[0]),
-        "intercept": float(model.intercept_),
+        "slope": float(slope),
+        "intercept": float(intercept),
         "r_squared": float(r2),
-        "n_samples": len(clean_df)
+        "n_samples": len(X)
     }
     
     return img, stats
 
 
+# Above this many points clustering switches to MiniBatchKMeans
+MINIBATCH_MIN_ROWS = 10_000
+
+
 def perform_clustering(df, n_clusters=3):
     """
-    Perform K-Means clustering on numeric columns.
+    Perform K-Means clustering on the first two numeric columns.
     
     Args:
         df: pandas DataFrame
         n_clusters: Number of clusters
     
     Returns:
-        Tuple of (base64 image, statistics dict)
+        Tuple of (PNG image bytes, statistics dict)
     """
     numeric_cols = get_numeric_columns(df)
     
     if len(numeric_cols) < 2:
         return None, {"error": "Need at least 2 numeric columns for clustering"}
     
-    # Use only numeric columns and remove NaN
-    clean_df = df[numeric_cols].dropna()
+    # Cluster on the two columns that are plotted, dropping rows with NaN
+    features = numeric_cols[:2]
+    X = _numeric_matrix(df, features)
+    X = X[~np.isnan(X).any(axis=1)]
     
-    if len(clean_df) < n_clusters:
+    if len(X) < n_clusters:
         return None, {"error": f"Not enough data points for {n_clusters} clusters"}
     
-    # Standardize features
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(clean_df)
+    # Standardize features (constant columns are left unscaled)
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+    std[std == 0] = 1.0
+    X_scaled = (X - mean) / std
     
-    # Perform K-Means clustering
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+    # Perform K-Means clustering; mini-batches for large inputs
+    if len(X) > MINIBATCH_MIN_ROWS:
+        kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=42,
+                                 batch_size=1024, n_init='auto')
+    else:
+        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init='auto')
     clusters = kmeans.fit_predict(X_scaled)
     
     # Create visualization using first two numeric columns
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = get_figure((10, 6))
+    ax = fig.subplots()
     
     scatter = ax.scatter(
-        clean_df.iloc[:, 0], 
-        clean_df.iloc[:, 1],
+        X[:, 0], 
+        X[:, 1],
         c=clusters, 
         cmap='Greens',
         s=50, 
@@ -200,7 +583,7 @@ def perform_clustering(df, n_clusters=3):
     )
     
     # Plot cluster centers (transform back to original scale)
-    centers_original = scaler.inverse_transform(kmeans.cluster_centers_)
+    centers_original = kmeans.cluster_centers_ * std + mean
     ax.scatter(
         centers_original[:, 0],
         centers_original[:, 1],
@@ -218,14 +601,14 @@ def perform_clustering(df, n_clusters=3):
     ax.set_title(f'K-Means Clustering (k={n_clusters})', fontsize=14, fontweight='bold')
     ax.legend()
     ax.grid(True, alpha=0.3)
-    plt.colorbar(scatter, ax=ax, label='Cluster')
+    fig.colorbar(scatter, ax=ax, label='Cluster')
     
-    img = plot_to_base64(fig)
+    img = plot_to_png(fig)
     
     stats = {
         "n_clusters": n_clusters,
-        "n_samples": len(clean_df),
-        "features_used": numeric_cols[:2],
+        "n_samples": len(X),
+        "features_used": features,
         "inertia": float(kmeans.inertia_)
     }
     
@@ -240,7 +623,7 @@ def plot_distribution(df):
         df: pandas DataFrame
     
     Returns:
-        Tuple of (base64 image, statistics dict)
+        Tuple of (PNG image bytes, statistics dict)
     """
     numeric_cols = get_numeric_columns(df)
     
@@ -251,27 +634,30 @@ def plot_distribution(df):
     n_cols = min(3, len(numeric_cols))
     n_rows = (len(numeric_cols) + n_cols - 1) // n_cols
     
-    fig, axes = plt.subplots(n_rows, n_cols, figsize=(15, 5 * n_rows))
+    fig = get_figure((15, 5 * n_rows))
     
     # Flatten axes array for easier iteration
-    if n_rows == 1 and n_cols == 1:
-        axes = [axes]
-    else:
-        axes = axes.flatten() if n_rows > 1 or n_cols > 1 else [axes]
+    axes = fig.subplots(n_rows, n_cols, squeeze=False).flatten()
+    
+    # Convert the numeric block once instead of building a Series per column
+    arr = _numeric_matrix(df, numeric_cols)
     
     for idx, col in enumerate(numeric_cols):
         ax = axes[idx]
-        data = df[col].dropna()
+        data = arr[:, idx]
+        data = data[~np.isnan(data)]
         
         # Create histogram with KDE
-        ax.hist(data, bins=30, alpha=0.7, color='#43A047', edgecolor='black')
+        _plot_histogram(ax, data, bins=30, alpha=0.7, color='#43A047', edgecolor='black')
         ax.set_xlabel(col, fontsize=10)
         ax.set_ylabel('Frequency', fontsize=10)
         ax.set_title(f'Distribution of {col}', fontsize=11, fontweight='bold')
         ax.grid(True, alpha=0.3)
         
         # Add statistics text
-        stats_text = f'Mean: {data.mean():.2f}\nStd: {data.std():.2f}'
+        mean = data.mean() if data.size else np.nan
+        std = data.std(ddof=1) if data.size > 1 else np.nan
+        stats_text = f'Mean: {mean:.2f}\nStd: {std:.2f}'
         ax.text(0.02, 0.98, stats_text, transform=ax.transAxes,
                 verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5),
                 fontsize=9)
@@ -280,8 +666,7 @@ def plot_distribution(df):
     for idx in range(len(numeric_cols), len(axes)):
         axes[idx].set_visible(False)
     
-    plt.tight_layout()
-    img = plot_to_base64(fig)
+    img = plot_to_png(fig)
     
     stats = {
         "n_variables": len(numeric_cols),
@@ -301,8 +686,42 @@ def generate_statistical_summary(df):
     Returns:
         Tuple of (HTML table, statistics dict)
     """
-    # Get descriptive statistics
-    desc = df.describe(include='all').transpose()
+    numeric_cols = get_numeric_columns(df)
+    datetime_cols = df.select_dtypes(include=['datetime', 'datetimetz']).columns.tolist()
+    described = set(numeric_cols) | set(datetime_cols)
+    other_cols = [col for col in df.columns if col not in described]
+    
+    # Parts are ordered like describe's statistics: count/unique/top/freq,
+    # then the datetime stats, then std
+    parts = []
+    
+    # count/unique/top/freq for non-numeric columns from one value_counts each
+    if other_cols:
+        rows = {}
+        for col in other_cols:
+            counts = df[col].value_counts()
+            rows[col] = {
+                "count": int(counts.sum()),
+                "unique": len(counts),
+                "top": counts.index[0] if len(counts) else np.nan,
+                "freq": int(counts.iloc[0]) if len(counts) else np.nan,
+            }
+        parts.append(pd.DataFrame(list(rows.values()), index=other_cols, dtype=object))
+    
+    if datetime_cols:
+        parts.append(df[datetime_cols].describe(include='all').transpose())
+    
+    # Vectorized describe for numeric columns only
+    if numeric_cols:
+        parts.append(df[numeric_cols].describe().transpose())
+    
+    # Mixed parts are combined as object dtype, as in describe(include='all'),
+    # so counts stay integers and datetime stats don't put NaT in other cells
+    if len(parts) > 1:
+        parts = [part.astype(object) for part in parts]
+    
+    # Combine in the original column order
+    desc = pd.concat(parts).reindex(df.columns) if parts else pd.DataFrame()
     
     # Convert to HTML
     html = desc.to_html(classes='stats-table', border=0)
@@ -310,13 +729,17 @@ def generate_statistical_summary(df):
     stats = {
         "n_rows": len(df),
         "n_columns": len(df.columns),
-        "n_numeric": len(get_numeric_columns(df)),
-        "memory_usage": f"{df.memory_usage(deep=True).sum() / 1024:.2f} KB"
+        "n_numeric": len(numeric_cols),
+        "memory_usage": f"{df.memory_usage(deep=False).sum() / 1024:.2f} KB"
     }
     
     return html, stats
 
 
+# Duplicate rows are only counted up to this many rows
+DUPLICATE_CHECK_MAX_ROWS = 100_000
+
+
 def generate_eda_report(df):
     """
     Generate a comprehensive EDA (Exploratory Data Analysis) report.
@@ -326,29 +749,38 @@ def generate_eda_report(df):
         df: pandas DataFrame
     
     Returns:
-        Tuple of (base64 image, statistics dict)
+        Tuple of (PNG image bytes, statistics dict)
     """
     numeric_cols = get_numeric_columns(df)
     
     if len(numeric_cols) == 0:
         return None, {"error": "No numeric columns found"}
     
+    # One pass over the numeric block, shared by every panel below
+    arr = _numeric_matrix(df, numeric_cols)
+    missing_all = df.isnull().sum()
+    
     # Create figure with multiple subplots
-    fig = plt.figure(figsize=(16, 12))
+    fig = get_figure((16, 12))
     gs = fig.add_gridspec(3, 2, hspace=0.3, wspace=0.3)
     
     # 1. Correlation heatmap
     ax1 = fig.add_subplot(gs[0, :])
     if len(numeric_cols) >= 2:
-        corr = df[numeric_cols].corr()
+        if missing_all[numeric_cols].any():
+            # Pairwise-complete correlation when values are missing
+            corr = df[numeric_cols].corr()
+        else:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                corr = pd.DataFrame(np.corrcoef(arr, rowvar=False),
+                                    index=numeric_cols, columns=numeric_cols)
         sns.heatmap(corr, annot=True, fmt='.2f', cmap='Greens', ax=ax1, 
                     cbar_kws={'label': 'Correlation'})
         ax1.set_title('Correlation Matrix', fontsize=14, fontweight='bold')
     
     # 2. Missing values
     ax2 = fig.add_subplot(gs[1, 0])
-    missing = df.isnull().sum()
-    missing = missing[missing > 0].sort_values(ascending=False)
+    missing = missing_all[missing_all > 0].sort_values(ascending=False)
     if len(missing) > 0:
         missing.plot(kind='barh', ax=ax2, color='#66BB6A')
         ax2.set_xlabel('Number of Missing Values')
@@ -369,7 +801,9 @@ def generate_eda_report(df):
     ax4 = fig.add_subplot(gs[2, 0])
     if len(numeric_cols) > 0:
         col_idx = 1 if len(numeric_cols) > 1 else 0
-        df[numeric_cols[col_idx]].hist(bins=30, ax=ax4, color='#66BB6A', edgecolor='black')
+        col_arr = arr[:, col_idx]
+        col_arr = col_arr[~np.isnan(col_arr)]
+        _plot_histogram(ax4, col_arr, bins=30, color='#66BB6A', edgecolor='black')
         ax4.set_xlabel(numeric_cols[col_idx])
         ax4.set_ylabel('Frequency')
         ax4.set_title(f'Distribution: {numeric_cols[col_idx]}', fontsize=12, fontweight='bold')
@@ -377,21 +811,27 @@ def generate_eda_report(df):
     # 5. Scatter plot if we have at least 2 numeric columns
     ax5 = fig.add_subplot(gs[2, 1])
     if len(numeric_cols) >= 2:
-        ax5.scatter(df[numeric_cols[0]], df[numeric_cols[1]], 
+        ax5.scatter(arr[:, 0], arr[:, 1], 
                    alpha=0.6, s=30, color='#43A047')
         ax5.set_xlabel(numeric_cols[0])
         ax5.set_ylabel(numeric_cols[1])
         ax5.set_title(f'{numeric_cols[1]} vs {numeric_cols[0]}', fontsize=12, fontweight='bold')
         ax5.grid(True, alpha=0.3)
     
-    img = plot_to_base64(fig)
+    img = plot_to_png(fig)
+    
+    # Hashing every row across all columns dominates EDA time on large files
+    if len(df) <= DUPLICATE_CHECK_MAX_ROWS:
+        duplicate_rows = int(df.duplicated().sum())
+    else:
+        duplicate_rows = f"not computed (over {DUPLICATE_CHECK_MAX_ROWS:,} rows)"
     
     stats = {
         "n_rows": len(df),
         "n_columns": len(df.columns),
         "n_numeric": len(numeric_cols),
-        "missing_values": int(df.isnull().sum().sum()),
-        "duplicate_rows": int(df.duplicated().sum())
+        "missing_values": int(missing_all.sum()),
+        "duplicate_rows": duplicate_rows
     }
     
     return img, stats
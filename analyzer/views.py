@@ -2,24 +2,36 @@
 Views for the analyzer app.
 Handles all HTTP requests and responses.
 """
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
 from django.http import JsonResponse, HttpResponse, FileResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib import messages
 from .models import UploadedFile
-from .forms import CSVUploadForm
+from .forms import CSVUploadForm, size_limit_message
 from . import utils
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from urllib.parse import quote
 import os
-import pandas as pd
 import tempfile
 
 
+# Worker pool for analysis and plotting (matplotlib's Agg renderer and the
+# numpy/pandas kernels release the GIL while they run)
+OPERATION_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+OPERATION_TIMEOUT = 120  # Seconds to wait for an operation before giving up
+
+
 def landing_page(request):
     """
     Landing page with CSV upload form.
     """
     form = CSVUploadForm()
-    return render(request, 'analyzer/landing.html', {'form': form})
+    return render(request, 'analyzer/landing.html', {
+        'form': form,
+        'max_upload_size': settings.MAX_UPLOAD_SIZE,
+    })
 
 
 def upload_csv(request):
@@ -30,6 +42,11 @@ def upload_csv(request):
     if request.method == 'POST':
         form = CSVUploadForm(request.POST, request.FILES)
         
+        # SizeLimitUploadHandler drops oversized files while they stream in
+        if getattr(request, 'upload_too_large', False):
+            messages.error(request, size_limit_message())
+            return redirect('landing')
+        
         if form.is_valid():
             # Save the uploaded file
             uploaded_file = form.save(commit=False)
@@ -37,17 +54,29 @@ def upload_csv(request):
             uploaded_file.file_size = request.FILES['file'].size
             uploaded_file.save()
             
-            # Load CSV to get row and column count
+            # Get row and column count from the raw bytes (no CSV parse)
+            shape = utils.quick_csv_shape(uploaded_file.file.path)
+            if shape is None:
+                messages.error(request, "Error reading CSV file.")
+                uploaded_file.delete()
+                return redirect('landing')
+            
+            # Parse the rows the analysis page shows so malformed files are
+            # rejected here; this also warms the cache for that page
             try:
-                df = pd.read_csv(uploaded_file.file.path)
-                uploaded_file.row_count = len(df)
-                uploaded_file.column_count = len(df.columns)
-                uploaded_file.save()
+                utils.read_sample(uploaded_file.id, uploaded_file.file.path)
             except Exception as e:
                 messages.error(request, f"Error reading CSV file: {e}")
                 uploaded_file.delete()
                 return redirect('landing')
             
+            uploaded_file.row_count, uploaded_file.column_count = shape
+            uploaded_file.save()
+            
+            # Parse in the background: warms the DataFrame cache and writes
+            # the Feather copy that later operations read from
+            OPERATION_EXECUTOR.submit(utils.get_df, uploaded_file.id, uploaded_file.file.path)
+            
             # Redirect to analysis page
             return redirect('analysis', file_id=uploaded_file.id)
         else:
@@ -66,8 +95,9 @@ def analysis_page(request, file_id):
     """
     uploaded_file = get_object_or_404(UploadedFile, id=file_id)
     
-    # Load the CSV file
-    df = utils.load_csv(uploaded_file.file.path)
+    # Load the leading rows only; the row count was stored at upload
+    df = utils.get_df(uploaded_file.id, uploaded_file.file.path,
+                      nrows=utils.SAMPLE_ROWS)
     
     if df is None:
         messages.error(request, "Error loading CSV file.")
@@ -82,7 +112,7 @@ def analysis_page(request, file_id):
     context = {
         'file': uploaded_file,
         'table_html': table_html,
-        'n_rows': len(df),
+        'n_rows': uploaded_file.row_count,
         'n_columns': len(df.columns),
         'n_numeric': len(numeric_cols),
         'columns': df.columns.tolist(),
@@ -92,6 +122,94 @@ def analysis_page(request, file_id):
     return render(request, 'analyzer/analysis.html', context)
 
 
+def _load_for_operation(uploaded_file, operation):
+    """
+    Load only the part of the CSV file an operation needs.
+    Preview reads the leading rows; regression and clustering read only the
+    two numeric columns they use. Everything else gets the full DataFrame.
+    """
+    file_id = uploaded_file.id
+    path = uploaded_file.file.path
+    
+    if operation not in ('preview', 'regression', 'clustering'):
+        return utils.get_df(file_id, path)
+    
+    sample = utils.get_df(file_id, path, nrows=utils.SAMPLE_ROWS)
+    if sample is None or operation == 'preview':
+        return sample
+    
+    # Both operations work on the first two numeric columns
+    numeric_cols = utils.get_numeric_columns(sample)[:2]
+    if len(numeric_cols) < 2:
+        # Let the operation report the error on the full data
+        return utils.get_df(file_id, path)
+    
+    df = utils.get_df(file_id, path, usecols=numeric_cols)
+    if df is not None and len(utils.get_numeric_columns(df)) < len(numeric_cols):
+        # A column looked numeric in the sample only; fall back to all columns
+        return utils.get_df(file_id, path)
+    return df
+
+
+def _run_operation(operation, df, uploaded_file, n_clusters):
+    """
+    Run one analytical operation on the DataFrame.
+    Returns a tuple of (PNG image bytes, statistics dict, HTML content);
+    statistics is None for an unknown operation.
+    """
+    img_png = None
+    stats = {}
+    html_content = None
+    
+    if operation == 'regression':
+        img_png, stats = utils.perform_linear_regression(df)
+        
+    elif operation == 'clustering':
+        img_png, stats = utils.perform_clustering(df, n_clusters)
+        
+    elif operation == 'distribution':
+        img_png, stats = utils.plot_distribution(df)
+        
+    elif operation == 'summary':
+        html_content, stats = utils.generate_statistical_summary(df)
+        
+    elif operation == 'eda':
+        img_png, stats = utils.generate_eda_report(df)
+        
+    elif operation == 'preview':
+        html_content = utils.generate_table_preview(df, max_rows=20)
+        stats = {
+            'n_rows': uploaded_file.row_count,
+            'n_columns': len(df.columns)
+        }
+    
+    else:
+        stats = None
+    
+    return img_png, stats, html_content
+
+
+def _save_visualization(img_png, uploaded_file, operation, n_clusters):
+    """
+    Write a rendered PNG under VISUALIZATION_ROOT and return its path.
+    The name only depends on the file and operation parameters, so identical
+    requests share one file and uploads never accumulate more than a few.
+    """
+    name = f'{uploaded_file.id}_{operation}'
+    if operation == 'clustering':
+        name += f'_k{n_clusters}'
+    
+    os.makedirs(settings.VISUALIZATION_ROOT, exist_ok=True)
+    path = os.path.join(settings.VISUALIZATION_ROOT, f'{name}.png')
+    
+    # Write to a temporary file first so readers never see a partial PNG
+    fd, tmp_path = tempfile.mkstemp(dir=settings.VISUALIZATION_ROOT, suffix='.png')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(img_png)
+    os.replace(tmp_path, path)
+    return path
+
+
 def perform_operation(request, file_id):
     """
     AJAX endpoint to perform analytical operations.
@@ -104,50 +222,37 @@ def perform_operation(request, file_id):
     operation = request.POST.get('operation')
     
     # Load the CSV file
-    df = utils.load_csv(uploaded_file.file.path)
+    df = _load_for_operation(uploaded_file, operation)
     
     if df is None:
         return JsonResponse({'error': 'Error loading CSV file'}, status=400)
     
-    # Perform the requested operation
-    img_base64 = None
-    stats = {}
-    html_content = None
-    
     try:
-        if operation == 'regression':
-            img_base64, stats = utils.perform_linear_regression(df)
-            
-        elif operation == 'clustering':
-            n_clusters = int(request.POST.get('n_clusters', 3))
-            img_base64, stats = utils.perform_clustering(df, n_clusters)
-            
-        elif operation == 'distribution':
-            img_base64, stats = utils.plot_distribution(df)
-            
-        elif operation == 'summary':
-            html_content, stats = utils.generate_statistical_summary(df)
-            
-        elif operation == 'eda':
-            img_base64, stats = utils.generate_eda_report(df)
-            
-        elif operation == 'preview':
-            html_content = utils.generate_table_preview(df, max_rows=20)
-            stats = {
-                'n_rows': len(df),
-                'n_columns': len(df.columns)
-            }
+        n_clusters = int(request.POST.get('n_clusters', 3))
         
-        else:
+        # Run the analysis and plotting on the shared worker pool
+        future = OPERATION_EXECUTOR.submit(
+            _run_operation, operation, df, uploaded_file, n_clusters
+        )
+        try:
+            img_png, stats, html_content = future.result(timeout=OPERATION_TIMEOUT)
+        except FuturesTimeoutError:
+            # The worker thread cannot be interrupted; the operation keeps
+            # running in the pool and its result is discarded.
+            return JsonResponse({'error': 'Operation timed out'}, status=504)
+        
+        if stats is None:
             return JsonResponse({'error': 'Unknown operation'}, status=400)
         
         # Check for errors in stats
         if stats and 'error' in stats:
             return JsonResponse({'error': stats['error']}, status=400)
         
-        # Store the current visualization in session for download
-        if img_base64:
-            request.session['current_viz'] = img_base64
+        # Keep the current visualization on disk for download; the session
+        # only holds its path
+        if img_png:
+            viz_path = _save_visualization(img_png, uploaded_file, operation, n_clusters)
+            request.session['current_viz_path'] = viz_path
             request.session['current_operation'] = operation
         
         response_data = {
@@ -156,8 +261,8 @@ def perform_operation(request, file_id):
             'stats': stats,
         }
         
-        if img_base64:
-            response_data['image'] = img_base64
+        if img_png:
+            response_data['image'] = utils.png_to_base64(img_png)
         
         if html_content:
             response_data['html'] = html_content
@@ -175,23 +280,21 @@ def download_visualization(request, file_id):
     uploaded_file = get_object_or_404(UploadedFile, id=file_id)
     
     # Get the current visualization from session
-    img_base64 = request.session.get('current_viz')
+    viz_path = request.session.get('current_viz_path')
     operation = request.session.get('current_operation', 'visualization')
     
-    if not img_base64:
+    if not viz_path or not os.path.isfile(viz_path):
         messages.error(request, "No visualization available to download.")
         return redirect('analysis', file_id=file_id)
     
-    # Convert base64 to image file
-    import base64
-    img_data = base64.b64decode(img_base64)
-    
-    # Create response with image
-    response = HttpResponse(img_data, content_type='image/png')
+    # Stream the stored PNG
     filename = f'{uploaded_file.original_filename.rsplit(".", 1)[0]}_{operation}.png'
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    
-    return response
+    return FileResponse(
+        open(viz_path, 'rb'),
+        content_type='image/png',
+        as_attachment=True,
+        filename=filename
+    )
 
 
 def download_csv(request, file_id):
@@ -200,11 +303,18 @@ def download_csv(request, file_id):
     """
     uploaded_file = get_object_or_404(UploadedFile, id=file_id)
     
-    # Return the file as download
-    response = FileResponse(
-        open(uploaded_file.file.path, 'rb'),
-        content_type='text/csv'
-    )
+    if settings.USE_X_ACCEL_REDIRECT:
+        # nginx streams the file itself; no bytes pass through the worker
+        response = HttpResponse(content_type='text/csv')
+        response['X-Accel-Redirect'] = quote(
+            settings.X_ACCEL_REDIRECT_PREFIX + uploaded_file.file.name
+        )
+    else:
+        # Return the file as download
+        response = FileResponse(
+            open(uploaded_file.file.path, 'rb'),
+            content_type='text/csv'
+        )
     response['Content-Disposition'] = f'attachment; filename="{uploaded_file.original_filename}"'
     
     return response
@@ -103,10 +103,22 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 # Media files (uploaded files)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+VISUALIZATION_ROOT = MEDIA_ROOT / 'tmp'  # Rendered plots kept for download
+
+# Let the front-end web server send downloads (nginx X-Accel-Redirect).
+# Requires an internal nginx location mapping the prefix to MEDIA_ROOT.
+USE_X_ACCEL_REDIRECT = os.environ.get('USE_X_ACCEL_REDIRECT', 'False') == 'True'
+X_ACCEL_REDIRECT_PREFIX = '/protected/'
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # File upload settings
+MAX_UPLOAD_SIZE = 10485760  # 10MB, largest CSV accepted
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
+FILE_UPLOAD_HANDLERS = [
+    'analyzer.upload_handlers.SizeLimitUploadHandler',  # Must come first
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]